@@ -13,13 +13,55 @@
 # You should have received a copy of the GNU General Public License along with this program.
 # If not, see <https://www.gnu.org/licenses/>.
 
-from sys import argv, stderr
-from os.path import basename
-from re import search
-
-def print_usage() -> None:
-	print(f"""\
-Usage: {basename(__file__)} [OPTIONS... [STRINGS..]]
+from sys import argv, stderr, stdout
+
+# SGR numbers of named colors
+NAMED: dict = {
+	'BLACK': 30, 'RED': 31, 'GREEN': 32, 'YELLOW': 33,
+	'BLUE': 34, 'MAGENTA': 35, 'CYAN': 36, 'WHITE': 37,
+	'BBLACK': 90, 'BRED': 91, 'BGREEN': 92, 'BYELLOW': 93,
+	'BBLUE': 94, 'BMAGENTA': 95, 'BCYAN': 96, 'BWHITE': 97,
+}
+NAMED_FG: dict = {name: f"{number}" for name, number in NAMED.items()}
+NAMED_BG: dict = {name: f"{number+10}" for name, number in NAMED.items()}
+
+# Escapes of ASCII characters for printing the escape sequence string
+ESCAPES: dict = {c: f"\\x{c:02x}" for c in (*range(0x20), 0x7f)} | {
+	ord('\\'): "\\\\", ord('\t'): "\\t", ord('\n'): "\\n", ord('\r'): "\\r",
+}
+
+# SGR fragment of each option without value
+OPT_SGR: dict = {
+	'-b': "1;", "--bold": "1;",
+	'-i': "3;", "--italic": "3;",
+	'-u': "4;", "--underline": "4;",
+	'-d': "21;", "--double-underline": "21;",
+	'-o': "53;", "--overline": "53;",
+	'-t': "9;", "--crossed-out": "9;",
+	'-k': "5;", "--blink": "5;",
+	'-s': "7;", "--swap": "7;",
+
+	'-C': "39;", "--no-color": "39;",
+	'-G': "49;", "--no-background": "49;",
+	'-B': "22;", "--no-bold": "22;",
+	'-I': "23;", "--no-italic": "23;",
+	'-U': "24;", "--no-underline": "24;",
+	'-O': "55;", "--no-overline": "55;",
+	'-T': "29;", "--no-crossed-out": "29;",
+	'-K': "25;", "--no-blink": "25;",
+	'-S': "27;", "--no-swap": "27;",
+	'-r': "0;", "--reset": "0;",
+}
+
+# Every option, a string argument is anything else
+OPTIONS: frozenset = frozenset(OPT_SGR) | {
+	'-h', "--help", '-v', "--version",
+	'-e', "--escape", '-n', "--newline", '-E', "--no-escape", '-N', "--no-newline",
+	'-c', "--color", '-g', "--background",
+}
+
+USAGE: str = """\
+Usage: {prog} [OPTIONS... [STRINGS..]]
 
 Print a string containing the escape sequence that produces ANSI colors.
 
@@ -77,49 +119,49 @@ Available colors:
 
 Examples:
   Print the escape sequence:
-    {basename(__file__)} --color RED --background BLUE
-    {basename(__file__)} -c RED -g BLUE
-    {basename(__file__)} -cg RED BLUE
+    {prog} --color RED --background BLUE
+    {prog} -c RED -g BLUE
+    {prog} -cg RED BLUE
   \\x1b[31;44m
-    {basename(__file__)} -gc RED BLUE
+    {prog} -gc RED BLUE
   \\x1b[41;34m
 
   Print the string with the escape sequence:
-    {basename(__file__)} -cg RED BLUE \"HELLO WORLD\"
+    {prog} -cg RED BLUE \"HELLO WORLD\"
   \\x1b[31;44mHELLO WORLD\\x1b[m
 
   Print the escaped string with colors:
-    {basename(__file__)} --escape -cg RED BLUE \"HELLO WORLD\"
+    {prog} --escape -cg RED BLUE \"HELLO WORLD\"
   HELLO WORLD
 
   Print the escaped string with words of different colors:
-    {basename(__file__)} -ecg RED BLUE HELLO -r ' ' -cg CYAN MAGENTA WORLD
+    {prog} -ecg RED BLUE HELLO -r ' ' -cg CYAN MAGENTA WORLD
   HELLO WORLD
 
   Print the escaped string with colors:
-    {basename(__file__)} -ecg RED BLUE --this-is-not-an-option
+    {prog} -ecg RED BLUE --this-is-not-an-option
   --this-is-not-an-option
 
   If you want to give a string that is equal to an option, it must be
   enclosed in quotation marks (for the shell) and start with a backslash
   (for the program). Single quotes are preferred than double quotes.
   Print the escaped string \"-E\" with colors:
-    {basename(__file__)} -ecg RED BLUE '\\-E'
+    {prog} -ecg RED BLUE '\\-E'
   -E
 
   In fact, any string starting with backslash will strip the backslash:
-    {basename(__file__)} -ecg RED BLUE '\\HELLO WORLD'
+    {prog} -ecg RED BLUE '\\HELLO WORLD'
   HELLO WORLD
-    {basename(__file__)} -ecg RED BLUE '\\\\HELLO WORLD'
+    {prog} -ecg RED BLUE '\\\\HELLO WORLD'
   \\HELLO WORLD
 
   Print the escaped string with hexadecimal colors:
-    {basename(__file__)} -ecg cc0000 \\#2986cc \"HELLO WORLD\"
-    {basename(__file__)} -ecg '#cc0000' \"#2986cc\" \"HELLO WORLD\"
+    {prog} -ecg cc0000 \\#2986cc \"HELLO WORLD\"
+    {prog} -ecg '#cc0000' \"#2986cc\" \"HELLO WORLD\"
   HELLO WORLD
 
   Print the escaped string with RGB colors:
-    {basename(__file__)} -ecg 255,0,0 1,99,255 \"HELLO WORLD\"
+    {prog} -ecg 255,0,0 1,99,255 \"HELLO WORLD\"
   HELLO WORLD
 
 Exit status: 
@@ -127,51 +169,66 @@ Exit status:
   Returns 0 otherwise.
 
 This program is licensed under GPL-3.0-or-later.
-""", end="")
-	exit(0)
+"""
 
-def print_about() -> None:
-	print("""\
+ABOUT: str = """\
 escolor 1.0.0
 Copyright © 2024 Jesús Arenas
 Official repository: https://github.com/podobu/escolor
 License GPLv3+: GNU GPL version 3 or later <https://gnu.org/licenses/gpl.html>.
-""", end="")
+"""
+
+def print_usage() -> None:
+	from os.path import basename
+	stdout.write(USAGE.replace('{prog}', basename(__file__)))
+	exit(0)
+
+def print_about() -> None:
+	stdout.write(ABOUT)
 	exit(0)
 
 def parse_options(argv: list, awv: str = "") -> list:
 	parsed_args: list = []
 	arg: str
-	swv: str = "" # shorts with values
-	lwv: list = [] # longs with values
+	swv: frozenset # shorts with values
+	lwv: frozenset = frozenset() # longs with values
+	argc: int = len(argv)
 	i: int = 0
 
 	while i < len(awv) and awv[i] != ':':
-		swv += awv[i]
 		i += 1
+	swv = frozenset(awv[:i])
 	if i + 1 < len(awv):
-		lwv = awv[i+1:].split(sep=':')
+		lwv = frozenset(awv[i+1:].split(sep=':'))
+
+	# Nothing to split if there are no grouped short options and the last
+	# argument is not an option missing its value
+	last: str = argv[-1] if argc else ""
+	if all(len(arg) < 3 or not arg.startswith('-') or arg.startswith('--') for arg in argv) \
+		and not (len(last) == 2 and last[0] == '-' and last[1] in swv) \
+		and not (len(last) > 2 and last.startswith('--') and last[2:] in lwv):
+		return list(argv)
 
 	i = 0
 
-	while i < len(argv):
+	while i < argc:
 		arg = argv[i]
 
-		if arg[0:1] == '-' and len(arg) > 1:
-			if arg[1:2] == '-' and len(arg) > 2:
+		if arg.startswith('-') and len(arg) > 1:
+			if arg.startswith('--') and len(arg) > 2:
 				parsed_args.append(arg)
 				if arg[2:] in lwv:
 					i += 1
-					if i < len(argv):
+					if i < argc:
 						parsed_args.append(argv[i])
 					else:
 						parsed_args.append("")
 			else:
 				for option in arg[1:]:
-					parsed_args.append("-" + option)
+					parsed_args.append(f"-{option}")
 					if option in swv:
 						i += 1
-						if i < len(argv):
+						if i < argc:
 							parsed_args.append(argv[i])
 						else:
 							parsed_args.append("")
@@ -183,6 +240,7 @@ def parse_options(argv: list, awv: str = "") -> list:
 	return parsed_args
 
 def throw_color_error(color: str = "") -> None:
+	from os.path import basename
 	if color:
 		color = "'" + color + "'"
 	else:
@@ -193,123 +251,109 @@ def throw_color_error(color: str = "") -> None:
 
 def get_color(color: str, background: int = 0) -> str:
 	color = color.upper()
+	named: str | None = (NAMED_BG if background else NAMED_FG).get(color)
+	if named is not None:
+		return named
 	if background: background = 10
-	match color:
-		case 'BLACK': color = f"{background+30}"
-		case 'RED': color = f"{background+31}"
-		case 'GREEN': color = f"{background+32}"
-		case 'YELLOW': color = f"{background+33}"
-		case 'BLUE': color = f"{background+34}"
-		case 'MAGENTA': color = f"{background+35}"
-		case 'CYAN': color = f"{background+36}"
-		case 'WHITE': color = f"{background+37}"
-		case 'BBLACK': color = f"{background+90}"
-		case 'BRED': color = f"{background+91}"
-		case 'BGREEN': color = f"{background+92}"
-		case 'BYELLOW': color = f"{background+93}"
-		case 'BBLUE': color = f"{background+94}"
-		case 'BMAGENTA': color = f"{background+95}"
-		case 'BCYAN': color = f"{background+96}"
-		case 'BWHITE': color = f"{background+97}"
-		case _:
-			# 8 bit color
-			if search(r"^\d{1,3}$", color) and int(color) < 256:
-				color = f"{background+38};5;{color}"
-			# hex color
-			elif search(r"^#?[\dA-F]{6}$", color):
-				color = color.lstrip("#")
-				r, g, b = (int(color[i:i+1], 16) * 16 + int(color[i+1:i+2], 16) for i in range(0, 5, 2))
-				color = f"{background+38};2;{r};{g};{b}"
-			# rgb color
-			elif search(r"^\d{1,3},\d{1,3},\d{1,3}$", color):
-				r, g, b = (int(x) for x in color.split(','))
-				if r < 256 and g < 256 and b < 256:
-					color = f"{background+38};2;{r};{g};{b}"
-				else:
-					return ""
+	# 8 bit color
+	if color.isdecimal() and len(color) <= 3:
+		# a number of up to three digits can only be an 8 bit color
+		return f"{background+38};5;{color}" if int(color) < 256 else ""
+	# hex color
+	hex_color: str = color.removeprefix("#")
+	if len(hex_color) == 6:
+		try:
+			r, g, b = bytes.fromhex(hex_color)
+			return f"{background+38};2;{r};{g};{b}"
+		except ValueError:
+			pass
+	# rgb color
+	rgb: list = color.split(',')
+	if len(rgb) == 3 and all(x.isdecimal() and len(x) <= 3 for x in rgb):
+		r, g, b = map(int, rgb)
+		if r < 256 and g < 256 and b < 256:
+			return f"{background+38};2;{r};{g};{b}"
+	return ""
+
+def main(argv: list) -> None:
+	# Returning
+	parts: list = ["\x1b["]
+	append = parts.append
+	write = stdout.write
+	output_string: str
+	# Option logic
+	parsed_args: list = parse_options(argv[1:], "cg")
+	n: int = len(parsed_args)
+	i: int = 0
+	arg: str
+	color: str
+	fragment: str
+	# Flags
+	escape: bool = False
+	newline: chr = '\n'
+
+	while i < n:
+		arg = parsed_args[i]
+
+		if arg not in OPTIONS:
+			# parts always ends in "\x1b[" or in a fragment ending in ";"
+			if parts[-1] == "\x1b[":
+				# no effects to open before the string
+				parts.pop()
 			else:
-					return ""
-	return color
-
-# Returning
-output_string: str = "\x1b["
-# Option logic
-parsed_args: list = parse_options(argv[1:], "cg")
-i: int = 0
-color: str
-# Flags
-escape: bool = False
-newline: chr = '\n'
-
-while i < len(parsed_args):
-
-	match parsed_args[i]:
-		case '-h' | "--help": print_usage()
-		case '-v' | "--version": print_about()
-
-		case '-e' | "--escape": escape = True
-		case '-n' | "--newline": newline = '\n'
-		case '-E' | "--no-escape": escape = False
-		case '-N' | "--no-newline": newline = ''
-
-		case '-c' | "--color":
-			if i < len(parsed_args) - 1:
-				color = get_color(parsed_args[i+1])
-				if not color:
-					throw_color_error(parsed_args[i+1])
+				parts[-1] = parts[-1].rstrip(";") + "m"
+			append(arg.removeprefix("\\"))
+			append("\x1b[")
+			i += 1
+			continue
+
+		fragment = OPT_SGR.get(arg)
+		if fragment is not None:
+			append(fragment)
+			i += 1
+			continue
+
+		match arg:
+			case '-h' | "--help": print_usage()
+			case '-v' | "--version": print_about()
+
+			case '-e' | "--escape": escape = True
+			case '-n' | "--newline": newline = '\n'
+			case '-E' | "--no-escape": escape = False
+			case '-N' | "--no-newline": newline = ''
+
+			case '-c' | "--color":
+				if i < n - 1:
+					color = get_color(parsed_args[i+1])
+					if not color:
+						throw_color_error(parsed_args[i+1])
+					else:
+						append(color + ";")
+						i += 1
 				else:
-					output_string += color + ";"
-					i += 1
-			else:
-				throw_color_error()
-		case '-g' | "--background":
-			if i < len(parsed_args) - 1:
-				color = get_color(parsed_args[i+1], 1)
-				if not color:
-					throw_color_error(parsed_args[i+1])
+					throw_color_error()
+			case '-g' | "--background":
+				if i < n - 1:
+					color = get_color(parsed_args[i+1], 1)
+					if not color:
+						throw_color_error(parsed_args[i+1])
+					else:
+						append(color + ";")
+						i += 1
 				else:
-					output_string += color + ";"
-					i += 1
-			else:
-				throw_color_error()
-		case '-b' | "--bold": output_string += "1;"
-		case '-i' | "--italic": output_string += "3;"
-		case '-u' | "--underline": output_string += "4;"
-		case '-d' | "--double-underline": output_string += "21;"
-		case '-o' | "--overline": output_string += "53;"
-		case '-t' | "--crossed-out": output_string += "9;"
-		case '-k' | "--blink": output_string += "5;"
-		case '-s' | "--swap": output_string += "7;"
-
-		case '-C' | "--no-color": output_string += "39;"
-		case '-G' | "--no-background": output_string += "49;"
-		case '-B' | "--no-bold": output_string += "22;"
-		case '-I' | "--no-italic": output_string += "23;"
-		case '-U' | "--no-underline": output_string += "24;"
-		case '-O' | "--no-overline": output_string += "55;"
-		case '-T' | "--no-crossed-out": output_string += "29;"
-		case '-K' | "--no-blink": output_string += "25;"
-		case '-S' | "--no-swap": output_string += "27;"
-		case '-r' | "--reset": output_string += "0;"
-		case _:
-			# output_string always ends in ";" or "\x1b["
-			if output_string[-1] == ";":
-				output_string = output_string.rstrip(";")
-				output_string += "m"
-			else:
-				output_string = output_string.rstrip("\x1b[")
-			parsed_args[i] = parsed_args[i].removeprefix("\\")
-			output_string += f"{parsed_args[i]}\x1b["
-
-	i += 1
-
-if escape:
-	print(f"{output_string.rstrip(';')}m", end=newline)
-else:
-	output_string = repr(f"{output_string.rstrip(';')}m")
-	match output_string[0]:
-		case "'":
-			output_string = output_string.strip("'")
-		case '"':
-			output_string = output_string.strip('"')
-	print(output_string, end=newline)
+					throw_color_error()
+
+		i += 1
+
+	output_string = f"{''.join(parts).rstrip(';')}m"
+	if not escape:
+		output_string = output_string.translate(ESCAPES)
+		# escape any other non-printable character as repr() does
+		if not output_string.isprintable():
+			output_string = "".join(c if c.isprintable() else repr(c)[1:-1] for c in output_string)
+	write(output_string)
+	if newline:
+		write(newline)
+
+if __name__ == '__main__':
+	main(argv)